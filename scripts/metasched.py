@@ -19,12 +19,17 @@ from src.logging_config import setup_logging
 from src.optimizer import Optimizer
 from src.protocol import Start, load_protocol, protocol_from_dict
 
-setup_logging()
 logger = logging.getLogger("main")
 
 app = typer.Typer(help="metasched - constraint-based scheduling optimizer and executor")
 
 
+@app.callback()
+def _main() -> None:
+    # set up file logging when a command runs, not at import time
+    setup_logging()
+
+
 def _show_incomplete_state(state: IncompleteState) -> None:
     """Display information about incomplete tasks."""
     typer.echo("Previous incomplete run found.")
@@ -1,4 +1,5 @@
 import asyncio
+import bisect
 import uuid
 from datetime import datetime
 from typing import AsyncGenerator
@@ -12,6 +13,10 @@ class ATask(BaseModel):
     content: str
 
 
+def _execution_time(task: ATask) -> datetime:
+    return task.execution_time
+
+
 class AwaitList:
     """
     Asynchronous task scheduler that waits for the execution time of tasks.
@@ -64,8 +69,8 @@ class AwaitList:
         async with self.condition:
             task_id = id if id is not None else uuid.uuid4()
             task = ATask(execution_time=execution_time, id=task_id, content=content)
-            self.tasks.append(task)
-            self.tasks.sort(key=lambda x: x.execution_time)  # Sort tasks by time
+            # Keep tasks ordered by time; insertion is stable for equal times
+            bisect.insort(self.tasks, task, key=_execution_time)
             self.condition.notify_all()  # Notify waiting processes
             return task
 
@@ -78,8 +83,13 @@ class AwaitList:
         async with self.condition:
             for i, task in enumerate(self.tasks):
                 if task.id == task_id:
-                    self.tasks[i] = ATask(
-                        execution_time=execution_time, id=task_id, content=content
+                    del self.tasks[i]
+                    bisect.insort(
+                        self.tasks,
+                        ATask(
+                            execution_time=execution_time, id=task_id, content=content
+                        ),
+                        key=_execution_time,
                     )
                     self.condition.notify_all()
                     return True
@@ -109,6 +119,20 @@ class AwaitList:
                     return True
             return False
 
+    async def clear_tasks(self) -> int:
+        """
+        Cancel all pending tasks under a single lock acquisition.
+
+        Returns:
+            int: The number of tasks that were cancelled.
+        """
+        async with self.condition:
+            count = len(self.tasks)
+            if count:
+                self.tasks.clear()
+                self.condition.notify_all()
+            return count
+
     async def wait_for_next_task(self) -> AsyncGenerator[ATask, None]:
         """
         Wait for the next task and yield it sequentially.
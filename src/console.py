@@ -25,18 +25,25 @@ def _format_state(state: ProtocolState) -> str:
 
 
 def _add_node_to_tree(tree: Tree, node: Node) -> None:
-    if isinstance(node, Protocol):
-        label = f"[bold]{node.name}[/] [dim]({node.duration})[/]"
-        branch = tree.add(label)
-    elif isinstance(node, Delay):
-        label = f"[yellow]Delay[/] [dim]{node.duration} from {node.from_type.name}[/]"
-        branch = tree.add(label)
-    elif isinstance(node, Start):
-        branch = tree
-    else:
-        branch = tree.add(str(node))
-    for child in node.post_node:
-        _add_node_to_tree(branch, child)
+    # Explicit stack instead of recursion so deep chains can't hit the
+    # recursion limit; children are pushed reversed to keep their order.
+    stack: list[tuple[Tree, Node]] = [(tree, node)]
+    while stack:
+        parent, current = stack.pop()
+        if isinstance(current, Protocol):
+            label = f"[bold]{current.name}[/] [dim]({current.duration})[/]"
+            branch = parent.add(label)
+        elif isinstance(current, Delay):
+            label = (
+                f"[yellow]Delay[/] [dim]{current.duration}"
+                f" from {current.from_type.name}[/]"
+            )
+            branch = parent.add(label)
+        elif isinstance(current, Start):
+            branch = parent
+        else:
+            branch = parent.add(str(current))
+        stack.extend((branch, child) for child in reversed(current.post_node))
 
 
 def print_protocol_tree(start: Start) -> None:
@@ -1,5 +1,6 @@
 import asyncio
 import logging
+import time
 import uuid
 from dataclasses import dataclass
 from datetime import datetime, timedelta
@@ -15,6 +16,7 @@ from src.optimizer import Optimizer
 from src.protocol import (
     Delay,
     FromType,
+    Node,
     Protocol,
     ProtocolState,
     Start,
@@ -31,7 +33,7 @@ class InterruptedAction(str, Enum):
     ABORT = "abort"
 
 
-@dataclass
+@dataclass(slots=True)
 class IncompleteState:
     """Information about an incomplete previous run."""
 
@@ -54,11 +56,17 @@ def check_incomplete_state(json_storage: JSONStorage) -> IncompleteState | None:
         data = json_storage.load()
     except FileNotFoundError:
         return None
-    protocols = [protocol_from_dict(d) for d in data["protocols"]]
-    all_nodes = sum((p.flatten() for p in protocols), [])
-    protocol_nodes = [n for n in all_nodes if isinstance(n, Protocol)]
-    interrupted = [n for n in protocol_nodes if n.state == ProtocolState.RUNNING]
-    pending = [n for n in protocol_nodes if n.state == ProtocolState.PENDING]
+    interrupted: list[Protocol] = []
+    pending: list[Protocol] = []
+    # single pass over every tree, partitioning Protocol nodes by state
+    for d in data["protocols"]:
+        for node in protocol_from_dict(d).iter_flatten():
+            if type(node) is not Protocol:
+                continue
+            if node.state == ProtocolState.RUNNING:
+                interrupted.append(node)
+            elif node.state == ProtocolState.PENDING:
+                pending.append(node)
     if interrupted or pending:
         return IncompleteState(
             interrupted_nodes=interrupted,
@@ -79,6 +87,8 @@ class Executor:
     ) -> None:
         self.await_list = AwaitList()
         self.protocols: list[Start] = []
+        # id -> node over all protocols; rebuilt lazily after self.protocols changes
+        self._node_index: dict[uuid.UUID, Node] | None = None
         self.optimizer = optimizer
         self.driver = driver
         self.json_storage = json_storage
@@ -97,6 +107,11 @@ class Executor:
                 )
             protocols = [protocol_from_dict(d) for d in data["protocols"]]
             self.protocols = [p for p in protocols if type(p) is Start]
+            # optimize merges trees without a recursion check, so restored ids
+            # must be unique just like in add_protocol
+            node_count = sum(len(start.flatten()) for start in self.protocols)
+            if len(self._get_node_index()) != node_count:
+                raise ValueError("State file contains duplicate node IDs")
             self._handle_interrupted_protocols(interrupted)
             asyncio.run(self.optimize())
 
@@ -177,8 +192,12 @@ class Executor:
                                 }
                             )
 
-    def _save_state(self) -> str:
-        """Save current protocol state with optimizer metadata."""
+    async def _save_state(self) -> str:
+        """Save current protocol state with optimizer metadata.
+
+        The snapshot is taken on the event loop; only the file write runs in
+        a worker thread so the loop is not blocked on disk I/O.
+        """
         data = {
             "metadata": {
                 "buffer_seconds": self.optimizer.buffer_seconds,
@@ -187,21 +206,25 @@ class Executor:
             },
             "protocols": [p.model_dump(mode="json") for p in self.protocols],
         }
-        return self.json_storage.save(data)
+        return await asyncio.to_thread(self.json_storage.save, data)
+
+    def _get_node_index(self) -> dict[uuid.UUID, Node]:
+        if self._node_index is None:
+            self._node_index = {}
+            for start in self.protocols:
+                self._node_index.update(start.index())
+        return self._node_index
 
     async def add_protocol(self, protocol: Start) -> Start:
         # check duplicate
         if type(protocol) is not Start:
             raise ValueError("Only Start protocol can be added")
-        all_exist_nodes: list[Start | Protocol | Delay] = sum(
-            [p.flatten() for p in self.protocols], []
-        )
-        all_exist_ids = [node.id for node in all_exist_nodes]
+        existing = self._get_node_index()
         ids = [node.id for node in protocol.flatten()]
-        all_ids = all_exist_ids + ids
-        if len(all_ids) != len(set(all_ids)):
+        if len(ids) != len(set(ids)) or any(node_id in existing for node_id in ids):
             raise ValueError("Protocol with the same ID already exists")
         self.protocols.append(protocol)
+        self._node_index = None
         await self.optimize()
         return protocol
 
@@ -212,13 +235,13 @@ class Executor:
         # optimize all protocol
         marged_protocol = Start()
         for starts in self.protocols:
-            marged_protocol > starts.post_node
+            # ids are unique across self.protocols (checked in add_protocol)
+            for node in starts.post_node:
+                marged_protocol.add(node, check_recursive=False)
         solver_status = self.optimizer.optimize_schedule(marged_protocol)
 
         # cancel all tasks in await list
-        tasks = self.await_list.get_tasks()
-        for task in tasks:
-            await self.await_list.cancel_task(task.id)
+        await self.await_list.clear_tasks()
 
         # get next task
         all_protocol: list[Protocol] = [
@@ -227,7 +250,7 @@ class Executor:
         protocols = [p for p in all_protocol if p.state == ProtocolState.PENDING]
         if len(protocols) == 0:
             logger.info({"function": "optimize", "type": "end", "message": "no tasks"})
-            self._save_state()
+            await self._save_state()
             await self.await_list.mark_done()
             return
         next_protocol = min(protocols, key=lambda x: x.scheduled_time or datetime.max)
@@ -238,7 +261,7 @@ class Executor:
         await self.await_list.add_task(
             execution_time=next_protocol.scheduled_time, content=str(next_protocol.id)
         )
-        filepath = self._save_state()
+        filepath = await self._save_state()
         logger.info(
             {
                 "function": "optimize",
@@ -261,21 +284,25 @@ class Executor:
             }
         )
         # get current node
-        all_protocols: list[Protocol] = sum([p.flatten() for p in self.protocols], [])
-        all_protocols = [node for node in all_protocols if type(node) is Protocol]
-        current_nodes = [
-            node for node in all_protocols if node.id == uuid.UUID(task.content)
-        ]
-        if len(current_nodes) == 0:
+        protocol_id = uuid.UUID(task.content)
+        current_protocol = self._get_node_index().get(protocol_id)
+        if current_protocol is None:
+            # the trees may have been edited after they were added
+            self._node_index = None
+            current_protocol = self._get_node_index().get(protocol_id)
+        if type(current_protocol) is not Protocol:
             raise ValueError(f"No protocol found for task: {task.content}")
-        current_protocol = current_nodes[0]
 
         # execute
         protocol_name: str = current_protocol.name
         current_protocol.state = ProtocolState.RUNNING
         current_protocol.started_time = datetime.now()
-        self._save_state()
+        await self._save_state()
+        # started/finished times feed scheduling and must stay wall-clock; the
+        # monotonic run time is only logged, so it survives clock adjustments
+        run_start = time.monotonic()
         result = await self.driver.run(protocol_name)
+        run_seconds = time.monotonic() - run_start
         current_protocol.state = ProtocolState.COMPLETED
         current_protocol.finished_time = datetime.now()
         logger.info(
@@ -287,6 +314,7 @@ class Executor:
                 "result": result,
                 "protocol_started_time": current_protocol.started_time.isoformat(),
                 "protocol_finished_time": current_protocol.finished_time.isoformat(),
+                "protocol_run_seconds": run_seconds,
             }
         )
         await self.optimize()
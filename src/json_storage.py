@@ -1,8 +1,18 @@
 import json
+import os
 from abc import ABC, abstractmethod
 from pathlib import Path
+from types import ModuleType
 from typing import Any
 
+# orjson is a declared dependency; the stdlib json path only serves
+# environments installed without it
+orjson: ModuleType | None
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class JSONStorage(ABC):
     """Abstract base class for storing and retrieving JSON data."""
@@ -20,7 +30,10 @@ class JSONStorage(ABC):
 
 class LocalJSONStorage(JSONStorage):
     """
-    Persists state to a single JSON file, overwritten on every save.
+    Persists state to a single JSON file, atomically replaced on every save.
+
+    Uses orjson when it is installed and the stdlib json module otherwise;
+    both write UTF-8 with two-space indentation.
     """
 
     def __init__(self, filepath: str | Path = ".state.json"):
@@ -28,12 +41,25 @@ class LocalJSONStorage(JSONStorage):
 
     def save(self, data: Any) -> str:
         self.filepath.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.filepath, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        if orjson is not None:
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        else:
+            payload = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+        # write a sibling temp file and rename it over the target, so a crash
+        # mid-write never leaves a truncated state file behind
+        tmp_path = self.filepath.with_name(self.filepath.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.filepath)
         return str(self.filepath)
 
     def load(self) -> Any:
         if not self.filepath.exists():
             raise FileNotFoundError(f"State file not found: {self.filepath}")
+        if orjson is not None:
+            with open(self.filepath, "rb") as f:
+                return orjson.loads(f.read())
         with open(self.filepath, "r", encoding="utf-8") as f:
             return json.load(f)
@@ -1,8 +1,81 @@
+import json
 import logging
 import os
-from datetime import datetime
+from datetime import date, datetime, time
+from time import strftime
+from types import ModuleType
+from typing import Any
 
-from pythonjsonlogger import jsonlogger
+orjson: ModuleType | None
+try:
+    import orjson
+except ImportError:  # same stdlib fallback as src.json_storage
+    orjson = None
+
+# Attributes every LogRecord carries; anything else was passed via `extra`.
+_RECORD_ATTRS = frozenset(
+    logging.LogRecord("", 0, "", 0, None, None, None).__dict__
+) | {"message", "asctime", "taskName"}
+
+
+def _json_default(obj: Any) -> str:
+    if isinstance(obj, (date, time)):
+        return obj.isoformat()
+    return str(obj)
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line.
+
+    Produces the same layout as python-json-logger did: ``asctime``,
+    ``levelname``, ``name`` and ``message`` first, then the keys of a dict
+    message (or ``extra``) merged in at the top level. Serialized with
+    orjson when it is installed.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        # (whole second, strftime text) of the last default-format timestamp
+        self._time_cache: tuple[int, str] = (-1, "")
+
+    def formatTime(self, record: logging.LogRecord, datefmt: str | None = None) -> str:
+        if datefmt:
+            return super().formatTime(record, datefmt)
+        # Records arrive in bursts within the same second, so only the
+        # millisecond suffix needs formatting for all but the first of them
+        second = int(record.created)
+        cached_second, text = self._time_cache
+        if second != cached_second:
+            text = strftime(self.default_time_format, self.converter(second))
+            self._time_cache = (second, text)
+        if self.default_msec_format:
+            return self.default_msec_format % (text, record.msecs)
+        return text
+
+    def format(self, record: logging.LogRecord) -> str:
+        if isinstance(record.msg, dict):
+            fields: dict[str, Any] = record.msg
+            message = ""
+        else:
+            fields = {}
+            message = record.getMessage()
+        entry: dict[str, Any] = {
+            "asctime": self.formatTime(record, self.datefmt),
+            "levelname": record.levelname,
+            "name": record.name,
+            "message": message,
+        }
+        entry.update(fields)
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        if orjson is not None:
+            return orjson.dumps(
+                entry, default=_json_default, option=orjson.OPT_NON_STR_KEYS
+            ).decode()
+        return json.dumps(entry, ensure_ascii=False, default=_json_default)
 
 
 def setup_logging(log_dir: str = "logs"):
@@ -19,12 +92,7 @@ def setup_logging(log_dir: str = "logs"):
         encoding="utf-8",
     )
     file_handler.setLevel(logging.DEBUG)
-    formatter = jsonlogger.JsonFormatter(
-        "{asctime}{levelname}{name}{message}",
-        style="{",
-        json_ensure_ascii=False,
-    )
-    file_handler.setFormatter(formatter)
+    file_handler.setFormatter(JsonFormatter())
     root_logger.addHandler(file_handler)
 
     # Suppress noisy library loggers
@@ -1,3 +1,4 @@
+from collections.abc import Sequence
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from uuid import UUID
@@ -14,8 +15,10 @@ STATUS_STR = {
     cp_model.UNKNOWN: "UNKNOWN",
 }
 
+_ONE_SECOND = timedelta(seconds=1)
 
-@dataclass
+
+@dataclass(slots=True)
 class ProtocolVars:
     duration_s: int
     started_s: int | None = None
@@ -25,31 +28,42 @@ class ProtocolVars:
     interval: cp_model.IntervalVar | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class DelayVars:
     duration_s: int
     offset_s: int
     loss: cp_model.IntVar | None = None
 
 
+def _var_name(prefix: str, suffix: str) -> str:
+    # CP-SAT accepts anonymous variables; names are only useful for debugging
+    return f"{prefix}_{suffix}" if prefix else ""
+
+
 def _create_protocol_vars(
-    model: cp_model.CpModel, pv: ProtocolVars, node_id: UUID, max_time: int
+    model: cp_model.CpModel,
+    pv: ProtocolVars,
+    node_id: UUID,
+    max_time: int,
+    name_vars: bool = False,
 ) -> None:
-    pv.start_time = model.NewIntVar(0, max_time, f"{node_id}_start_time")
-    pv.finish_time = model.NewIntVar(0, max_time, f"{node_id}_finish_time")
+    prefix = node_id.hex if name_vars else ""
+    # Already started/finished times are pinned through the variable domain
+    # instead of an extra equality constraint per variable
+    start_lb, start_ub = 0, max_time
+    finish_lb, finish_ub = 0, max_time
+    size = pv.duration_s
     if pv.started_s is not None:
-        model.Add(pv.start_time == pv.started_s)
+        start_lb = start_ub = pv.started_s
         if pv.finished_s is not None:
-            model.Add(pv.finish_time == pv.finished_s)
-            pv.interval = model.NewIntervalVar(
-                pv.start_time,
-                pv.finished_s - pv.started_s,
-                pv.finish_time,
-                f"{node_id}_interval",
-            )
-            return
+            finish_lb = finish_ub = pv.finished_s
+            size = pv.finished_s - pv.started_s
+    pv.start_time = model.NewIntVar(start_lb, start_ub, _var_name(prefix, "start_time"))
+    pv.finish_time = model.NewIntVar(
+        finish_lb, finish_ub, _var_name(prefix, "finish_time")
+    )
     pv.interval = model.NewIntervalVar(
-        pv.start_time, pv.duration_s, pv.finish_time, f"{node_id}_interval"
+        pv.start_time, size, pv.finish_time, _var_name(prefix, "interval")
     )
 
 
@@ -59,13 +73,16 @@ def _create_delay_loss(
     dv: DelayVars,
     pvars: dict[UUID, ProtocolVars],
     max_time: int = 0,
+    name_vars: bool = False,
 ) -> cp_model.IntVar:
-    dv.loss = model.NewIntVar(0, max_time, f"{delay_node.id}_loss")
+    prefix = delay_node.id.hex if name_vars else ""
+    dv.loss = model.NewIntVar(0, max_time, _var_name(prefix, "loss"))
     pre = delay_node.pre_node
-    if isinstance(pre, protocol.Protocol) and pre.id in pvars:
+    # every Protocol node of the tree has an entry in pvars
+    if type(pre) is protocol.Protocol:
         pre_pv = pvars[pre.id]
         for post_node in delay_node.post_node:
-            if isinstance(post_node, protocol.Protocol) and post_node.id in pvars:
+            if type(post_node) is protocol.Protocol:
                 post_pv = pvars[post_node.id]
                 if pre_pv.finish_time is not None and post_pv.start_time is not None:
                     diff = post_pv.start_time - pre_pv.finish_time
@@ -76,29 +93,30 @@ def _create_delay_loss(
 
 
 def get_oldest_time(
-    protocols: list[protocol.Protocol | protocol.Delay | protocol.Start],
+    protocols: Sequence[protocol.Node],
+    default: datetime | None = None,
 ) -> datetime:
-    min_time = min(
+    oldest = min(
         (
-            p.started_time.timestamp()
+            p.started_time
             for p in protocols
-            if isinstance(p, protocol.Protocol) and p.started_time is not None
+            if type(p) is protocol.Protocol and p.started_time is not None
         ),
-        default=0,
+        default=None,
     )
-    if min_time == 0:
-        return datetime.now()
-    return datetime.fromtimestamp(min_time)
+    if oldest is None:
+        return default if default is not None else datetime.now()
+    return oldest
 
 
 def sum_durations(
-    protocols: list[protocol.Protocol | protocol.Delay | protocol.Start],
+    protocols: Sequence[protocol.Node],
 ) -> float:
     return sum(
         (
             p.duration.total_seconds()
             for p in protocols
-            if isinstance(p, (protocol.Protocol | protocol.Delay))
+            if type(p) is protocol.Protocol or type(p) is protocol.Delay
         ),
         start=0,
     )
@@ -111,6 +129,10 @@ class TimeSecondsConverter:
     def time_to_seconds(self, time: datetime) -> float:
         return (time - self.start_time).total_seconds()
 
+    def time_to_int_seconds(self, time: datetime) -> int:
+        """Whole seconds since start_time, without a float round trip."""
+        return (time - self.start_time) // _ONE_SECOND
+
     def seconds_to_time(self, seconds: float) -> datetime:
         return self.start_time + timedelta(seconds=seconds)
 
@@ -121,94 +143,93 @@ class Optimizer:
         buffer_seconds: int = 0,
         time_loss_weight: int = 100,
         max_solve_time: int = 3,
+        name_vars: bool = False,
     ) -> None:
         self.buffer_seconds = buffer_seconds
         self.time_loss_weight = time_loss_weight
         self.max_solve_time = max_solve_time
+        # label CP-SAT variables with node ids (for inspecting the model)
+        self.name_vars = name_vars
 
     def optimize_schedule(self, start: protocol.Start) -> str:
         nodes = start.flatten()
-        oldest_time = get_oldest_time(nodes)
-        elapsed_s = int((datetime.now() - oldest_time).total_seconds())
-        max_time = (
-            elapsed_s + int(sum_durations(nodes)) + len(nodes) * self.buffer_seconds
-        )
-        tsc = TimeSecondsConverter(oldest_time)
 
-        # Build flat lookup dicts from domain tree
+        # Single pass over the tree: partition the nodes and convert each
+        # duration once
+        protocol_nodes: list[protocol.Protocol] = []
+        delay_nodes: list[protocol.Delay] = []
         pvars: dict[UUID, ProtocolVars] = {}
         dvars: dict[UUID, DelayVars] = {}
         for node in nodes:
-            if isinstance(node, protocol.Protocol):
-                started_s = (
-                    int(tsc.time_to_seconds(node.started_time))
-                    if node.started_time
-                    else None
-                )
-                finished_s = (
-                    int(tsc.time_to_seconds(node.finished_time))
-                    if node.finished_time
-                    else None
-                )
+            if type(node) is protocol.Protocol:
+                protocol_nodes.append(node)
                 pvars[node.id] = ProtocolVars(
-                    duration_s=int(node.duration.total_seconds() + self.buffer_seconds),
-                    started_s=started_s,
-                    finished_s=finished_s,
+                    duration_s=int(node.duration.total_seconds() + self.buffer_seconds)
                 )
-            elif isinstance(node, protocol.Delay):
-                total_s = node.duration.total_seconds()
-                if total_s < self.buffer_seconds:
+            elif type(node) is protocol.Delay:
+                duration_s = node.duration.total_seconds()
+                if duration_s < self.buffer_seconds:
                     raise ValueError(
-                        f"Delay duration {total_s} is shorter than buffer {self.buffer_seconds}"
+                        f"Delay duration {duration_s} is shorter than buffer {self.buffer_seconds}"
                     )
+                delay_nodes.append(node)
                 dvars[node.id] = DelayVars(
-                    duration_s=int(total_s - self.buffer_seconds),
+                    duration_s=int(duration_s - self.buffer_seconds),
                     offset_s=int(node.offset.total_seconds()),
                 )
+        now = datetime.now()
+        oldest_time = get_oldest_time(nodes, default=now)
+        elapsed_s = int((now - oldest_time).total_seconds())
+        max_time = (
+            elapsed_s + int(sum_durations(nodes)) + len(nodes) * self.buffer_seconds
+        )
+        tsc = TimeSecondsConverter(oldest_time)
+
+        # Pin already started/finished protocols relative to the oldest start
+        for node in protocol_nodes:
+            pv = pvars[node.id]
+            if node.started_time:
+                pv.started_s = tsc.time_to_int_seconds(node.started_time)
+            if node.finished_time:
+                pv.finished_s = tsc.time_to_int_seconds(node.finished_time)
 
         # Create solver model
         model = cp_model.CpModel()
 
         intervals = []
+        finish_times = []
         makespan = model.NewIntVar(0, max_time, "makespan")
 
         for node_id, pv in pvars.items():
-            _create_protocol_vars(model, pv, node_id, max_time)
+            _create_protocol_vars(model, pv, node_id, max_time, self.name_vars)
             if pv.interval is not None:
                 intervals.append(pv.interval)
             if pv.finish_time is not None:
-                model.Add(makespan >= pv.finish_time)
+                finish_times.append(pv.finish_time)
         model.AddNoOverlap(intervals)
+        if finish_times:
+            model.AddMaxEquality(makespan, finish_times)
 
         # Ordering constraints from domain tree
-        for node in nodes:
-            if not isinstance(node, protocol.Protocol):
-                continue
-            if node.id not in pvars:
+        for node in protocol_nodes:
+            finish_time = pvars[node.id].finish_time
+            if finish_time is None:
                 continue
-            pv = pvars[node.id]
             for post_node in node.post_node:
-                if isinstance(post_node, protocol.Protocol):
-                    post_pv = pvars[post_node.id]
-                    if pv.finish_time is not None and post_pv.start_time is not None:
-                        model.Add(pv.finish_time <= post_pv.start_time)
-                elif isinstance(post_node, protocol.Delay):
+                if type(post_node) is protocol.Protocol:
+                    post_start = pvars[post_node.id].start_time
+                    if post_start is not None:
+                        model.Add(finish_time <= post_start)
+                elif type(post_node) is protocol.Delay:
                     for delay_post in post_node.post_node:
-                        if (
-                            isinstance(delay_post, protocol.Protocol)
-                            and delay_post.id in pvars
-                        ):
-                            delay_post_pv = pvars[delay_post.id]
-                            if (
-                                pv.finish_time is not None
-                                and delay_post_pv.start_time is not None
-                            ):
-                                model.Add(pv.finish_time <= delay_post_pv.start_time)
+                        if type(delay_post) is protocol.Protocol:
+                            post_start = pvars[delay_post.id].start_time
+                            if post_start is not None:
+                                model.Add(finish_time <= post_start)
 
         # Delay loss constraints
-        delay_nodes = [n for n in nodes if isinstance(n, protocol.Delay)]
         losses = [
-            _create_delay_loss(model, dn, dvars[dn.id], pvars, max_time)
+            _create_delay_loss(model, dn, dvars[dn.id], pvars, max_time, self.name_vars)
             for dn in delay_nodes
         ]
 
@@ -218,13 +239,12 @@ class Optimizer:
         status = solver.Solve(model)
 
         if status in (cp_model.OPTIMAL, cp_model.FEASIBLE, cp_model.UNKNOWN):
-            for node in nodes:
-                if isinstance(node, protocol.Protocol) and node.id in pvars:
-                    pv = pvars[node.id]
-                    if pv.start_time is not None and pv.finish_time is not None:
-                        node.scheduled_time = tsc.seconds_to_time(
-                            solver.Value(pv.start_time)
-                        )
+            for node in protocol_nodes:
+                pv = pvars[node.id]
+                if pv.start_time is not None and pv.finish_time is not None:
+                    node.scheduled_time = tsc.seconds_to_time(
+                        solver.Value(pv.start_time)
+                    )
         else:
             status_name = STATUS_STR.get(status, "UNKNOWN")
             raise ValueError(f"No optimal schedule found. (status={status_name})")
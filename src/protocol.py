@@ -1,14 +1,15 @@
 import importlib
+from collections.abc import Iterator
 from datetime import datetime, timedelta
 from enum import Enum
 from pathlib import Path
-from typing import Annotated, Optional, Self
+from typing import Annotated, Literal, Optional, Self
 from uuid import UUID, uuid4
 
-from pydantic import BaseModel, Discriminator, Field, Tag, TypeAdapter, model_validator
+from pydantic import BaseModel, Field, TypeAdapter, model_validator
 
 
-class NodeType(Enum):
+class NodeType(str, Enum):
     START = "start"
     DELAY = "delay"
     PROTOCOL = "protocol"
@@ -40,69 +41,107 @@ class Node(BaseModel):
         return self
 
     def __gt__(self, other: "Node | list[Node]") -> Self:
+        # attaching children never re-parents self, so walk up to the root once
+        top = self.top
         if not isinstance(other, list):
-            self.add(other)
+            if top.is_recursive(other):
+                raise ValueError("Cannot add a recursive node")
+            self.add(other, check_recursive=False)
         elif isinstance(other, list):
+            # flatten the tree once for the whole batch instead of once per node
+            tree_ids = top._tree_ids()
             for node in other:
-                self.add(node)
-        return self.top
+                if node.id in tree_ids:
+                    raise ValueError("Cannot add a recursive node")
+                self.add(node, check_recursive=False)
+                tree_ids.update(n.id for n in node.flatten())
+        return top
+
+    def _tree_ids(self) -> set[UUID]:
+        return {node.id for node in self.top.flatten()}
 
     def is_recursive(self, other: "Node") -> bool:
-        return other.id in [node.id for node in self.top.flatten()]
+        # stop at the first match instead of collecting every id first
+        other_id = other.id
+        return any(node.id == other_id for node in self.top.iter_flatten())
 
     @property
     def top(self) -> Self:
-        if self.pre_node is not None:
-            return self.pre_node.top
-        return self
-
-    def add(self, other: "Node") -> None:
-        if self.is_recursive(other):
+        # walk parents in a loop; not cached because subtrees get re-parented
+        # (e.g. Executor.optimize merges every Start under a fresh root)
+        node: Node = self
+        while node.pre_node is not None:
+            node = node.pre_node
+        return node  # type: ignore
+
+    def add(self, other: "Node", check_recursive: bool = True) -> None:
+        # check_recursive=False skips the whole-tree scan when the caller
+        # already knows `other` is not part of this tree
+        if check_recursive and self.is_recursive(other):
             raise ValueError("Cannot add a recursive node")
         self.post_node.append(other)
         other.pre_node = self
 
+    def iter_flatten(self) -> Iterator["Node"]:
+        """Yield this node and its descendants depth-first, lazily."""
+        stack: list[Node] = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            # push children reversed so they are visited in their original order
+            stack.extend(reversed(node.post_node))
+
     def flatten(self) -> list["Node"]:
-        flat: list[Node] = [self]
-        for child in self.post_node:
-            flat.extend(child.flatten())
-        return flat
+        return list(self.iter_flatten())
+
+    def _label(self) -> str:
+        return f"{type(self).__name__}()"
+
+    def __str__(self, indent: int = 0) -> str:
+        lines: list[str] = [self._label()]
+        stack: list[tuple[Node, int]] = [
+            (child, indent + 2) for child in reversed(self.post_node)
+        ]
+        while stack:
+            node, level = stack.pop()
+            lines.append(f"{' ' * level}{node._label()}")
+            stack.extend((child, level + 2) for child in reversed(node.post_node))
+        return "\n".join(lines)
+
+    def index(self) -> dict[UUID, "Node"]:
+        """Map every node id in this subtree to its node, for repeated lookups."""
+        return {node.id: node for node in self.flatten()}
 
     def get_node(self, id: UUID) -> Optional["Node"]:
-        if self.id == id:
-            return self
-        for child in self.post_node:
-            result = child.get_node(id)
-            if result is not None:
-                return result
+        # same depth-first order as flatten, stopping at the first match
+        stack: list[Node] = [self]
+        while stack:
+            node = stack.pop()
+            if node.id == id:
+                return node
+            stack.extend(reversed(node.post_node))
         return None
 
 
 class Start(Node):
-    node_type: NodeType = NodeType.START
+    node_type: Literal[NodeType.START] = NodeType.START
 
-    def __str__(self, indent: int = 0) -> str:
-        base = "Start()"
-        for child in self.post_node:
-            base += f"\n{' ' * (indent + 2)}{child.__str__(indent + 2)}"
-        return base
+    def _label(self) -> str:
+        return "Start()"
 
 
 class Delay(Node):
-    node_type: NodeType = NodeType.DELAY
+    node_type: Literal[NodeType.DELAY] = NodeType.DELAY
     duration: timedelta = Field(default_factory=lambda: timedelta(seconds=0))
     from_type: FromType = FromType.START
     offset: timedelta = Field(default_factory=lambda: timedelta(seconds=0))
 
-    def __str__(self, indent: int = 0) -> str:
-        base = f"Delay(duration={self.duration}, from_type={self.from_type}, offset={self.offset})"
-        for child in self.post_node:
-            base += f"\n{' ' * (indent + 2)}{child.__str__(indent + 2)}"
-        return base
+    def _label(self) -> str:
+        return f"Delay(duration={self.duration}, from_type={self.from_type}, offset={self.offset})"
 
 
 class Protocol(Node):
-    node_type: NodeType = NodeType.PROTOCOL
+    node_type: Literal[NodeType.PROTOCOL] = NodeType.PROTOCOL
     name: str = ""
     duration: timedelta = Field(default_factory=lambda: timedelta(seconds=0))
     state: ProtocolState = ProtocolState.PENDING
@@ -110,8 +149,8 @@ class Protocol(Node):
     started_time: datetime | None = None
     finished_time: datetime | None = None
 
-    def __str__(self, indent: int = 0) -> str:
-        base = (
+    def _label(self) -> str:
+        return (
             f"Protocol(name={self.name}"
             f", state={self.state.value}"
             f", duration={self.duration}"
@@ -119,23 +158,10 @@ class Protocol(Node):
             f", started_time={self.started_time}"
             f", finished_time={self.finished_time})"
         )
-        for child in self.post_node:
-            base += f"\n{' ' * (indent + 2)}{child.__str__(indent + 2)}"
-        return base
-
 
-def _node_discriminator(v: dict | Node) -> str:
-    if isinstance(v, dict):
-        return v.get("node_type", "")
-    return v.node_type.value
 
-
-NodeUnion = Annotated[
-    Annotated[Start, Tag("start")]
-    | Annotated[Delay, Tag("delay")]
-    | Annotated[Protocol, Tag("protocol")],
-    Discriminator(_node_discriminator),
-]
+# Tagged union on the node_type value, resolved natively by pydantic-core
+NodeUnion = Annotated[Start | Delay | Protocol, Field(discriminator="node_type")]
 
 # Rebuild models to resolve forward references to NodeUnion
 Node.model_rebuild()
@@ -146,14 +172,39 @@ Protocol.model_rebuild()
 _node_adapter: TypeAdapter[Start | Delay | Protocol] = TypeAdapter(NodeUnion)
 
 
+_NODE_CLASSES: dict[str, type[Start | Delay | Protocol]] = {
+    NodeType.START.value: Start,
+    NodeType.DELAY.value: Delay,
+    NodeType.PROTOCOL.value: Protocol,
+}
+
+
 def protocol_from_dict(data: dict) -> Start | Delay | Protocol:
-    return _node_adapter.validate_python(data)
+    # Validating the root through its own class links its children once;
+    # going through the union adapter runs _link_children twice on the root.
+    node_class = None
+    if isinstance(data, dict):
+        tag = data.get("node_type")
+        if isinstance(tag, str):
+            node_class = _NODE_CLASSES.get(tag)
+    if node_class is None:
+        # let the adapter report malformed input or an unknown/missing tag
+        return _node_adapter.validate_python(data)
+    return node_class.model_validate(data)
+
+
+_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
 
 
 def format_protocol(start: Start) -> str:
-    protocol_nodes: list[Protocol] = [
-        node for node in start.flatten() if type(node) is Protocol
-    ]
+    # one traversal, partitioned by node type
+    protocol_nodes: list[Protocol] = []
+    delay_nodes: list[Delay] = []
+    for node in start.flatten():
+        if type(node) is Protocol:
+            protocol_nodes.append(node)
+        elif type(node) is Delay:
+            delay_nodes.append(node)
     sorted_nodes = sorted(
         protocol_nodes, key=lambda x: x.scheduled_time or datetime.max
     )
@@ -165,7 +216,9 @@ def format_protocol(start: Start) -> str:
         raise ValueError("No scheduled times found.")
     total_duration = finish_time - start_time + last_duration
 
-    txt = f"Schedule: (total duration: {total_duration})\n"
+    parts: list[str] = [f"Schedule: (total duration: {total_duration})\n"]
+    # formatted finish times, reused for the delay lines below
+    finished_strs: dict[UUID, str] = {}
     for node in sorted_nodes:
         if node.scheduled_time is not None:
             started_time = node.started_time or node.scheduled_time
@@ -175,18 +228,16 @@ def format_protocol(start: Start) -> str:
             else:
                 state = f"[{node.state.value.capitalize()}]"
             duration = finished_time - node.scheduled_time
-            txt += (
+            finished_str = finished_time.strftime(_TIME_FORMAT)
+            finished_strs[node.id] = finished_str
+            parts.append(
                 f" - {node.name}: "
                 f"[{timedelta(seconds=round((started_time - start_time).total_seconds()))}] "
-                f"{started_time.strftime('%Y-%m-%d %H:%M:%S')} ~ "
-                f"{finished_time.strftime('%Y-%m-%d %H:%M:%S')}"
+                f"{started_time.strftime(_TIME_FORMAT)} ~ {finished_str}"
                 f" (Duration: {timedelta(seconds=round(duration.total_seconds()))})"
                 f" {state}\n"
             )
-    delay_nodes: list[Delay] = [
-        node for node in start.flatten() if isinstance(node, Delay)
-    ]
-    txt += "Delay:\n"
+    parts.append("Delay:\n")
     for delay in delay_nodes:
         pre_node = delay.pre_node
         if pre_node is None:
@@ -199,16 +250,19 @@ def format_protocol(start: Start) -> str:
             elif pre_node.scheduled_time is not None:
                 pre_node_finish = pre_node.scheduled_time + pre_node.duration
             true_duration = post_node.scheduled_time - pre_node_finish
-            txt += (
+            pre_node_finish_str = finished_strs.get(pre_node.id)
+            if pre_node_finish_str is None:
+                pre_node_finish_str = pre_node_finish.strftime(_TIME_FORMAT)
+            parts.append(
                 f" - {pre_node.name}"
                 " -- "
-                f"{pre_node_finish.strftime('%Y-%m-%d %H:%M:%S')} "
-                f"~ {post_node.scheduled_time.strftime('%Y-%m-%d %H:%M:%S')}"
+                f"{pre_node_finish_str} "
+                f"~ {post_node.scheduled_time.strftime(_TIME_FORMAT)}"
                 f" | {true_duration}(target: {delay.duration + delay.offset})"
                 " -> "
                 f"{post_node.name}\n"
             )
-    return txt
+    return "".join(parts)
 
 
 def load_protocol(protocolfile: Path) -> Start:
@@ -7,8 +7,9 @@ class MaholoSettings(BaseSettings):
     base_path: str = "C:\\BioApl\\DataSet\\proteo-03\\Protocol\\"
     microscope_image_dir: str | None = None
 
+    # read once at import; freeze so the shared instance can't drift
     model_config = SettingsConfigDict(
-        env_file=".env", env_file_encoding="utf-8", env_prefix="MAHOLO_"
+        env_file=".env", env_file_encoding="utf-8", env_prefix="MAHOLO_", frozen=True
     )
 
 
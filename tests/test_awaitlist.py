@@ -62,6 +62,16 @@ class TestAwaitList:
         al = AwaitList()
         assert await al.cancel_task(uuid.uuid4()) is False
 
+    @pytest.mark.asyncio
+    async def test_clear_tasks(self):
+        al = AwaitList()
+        now = datetime.now()
+        for i in range(3):
+            await al.add_task(now + timedelta(seconds=i), f"task{i}")
+        assert await al.clear_tasks() == 3
+        assert al.get_tasks() == []
+        assert await al.clear_tasks() == 0
+
     @pytest.mark.asyncio
     async def test_update_task(self):
         al = AwaitList()
@@ -73,6 +83,15 @@ class TestAwaitList:
         assert updated.content == "new"
         assert updated.execution_time == new_time
 
+    @pytest.mark.asyncio
+    async def test_update_task_keeps_order(self):
+        al = AwaitList()
+        now = datetime.now()
+        first = await al.add_task(now + timedelta(seconds=5), "first")
+        await al.add_task(now + timedelta(seconds=10), "second")
+        await al.update_task(first.id, now + timedelta(seconds=15), "first")
+        assert [t.content for t in al.get_tasks()] == ["second", "first"]
+
     @pytest.mark.asyncio
     async def test_update_nonexistent(self):
         al = AwaitList()
@@ -0,0 +1,89 @@
+"""Tests for src.executor — protocol registration and task lookup."""
+
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from src.awaitlist import ATask
+from src.driver import DummyDriver
+from src.executor import Executor
+from src.json_storage import LocalJSONStorage
+from src.optimizer import Optimizer
+from src.protocol import Delay, Protocol, ProtocolState, Start
+
+
+@pytest.fixture
+def executor(tmp_path: Path) -> Executor:
+    return Executor(
+        optimizer=Optimizer(max_solve_time=1),
+        driver=DummyDriver(),
+        json_storage=LocalJSONStorage(filepath=tmp_path / ".state.json"),
+    )
+
+
+def _task(node_id) -> ATask:
+    return ATask(execution_time=datetime.now(), id=node_id, content=str(node_id))
+
+
+class TestExecutor:
+    @pytest.mark.asyncio
+    async def test_add_protocol_rejects_duplicate_id(self, executor: Executor):
+        s1 = Start()
+        p1 = Protocol(name="P1", duration=timedelta(seconds=1))
+        s1 > p1
+        await executor.add_protocol(s1)
+
+        s2 = Start()
+        s2 > Protocol(name="P1 again", id=p1.id)
+        with pytest.raises(ValueError, match="same ID"):
+            await executor.add_protocol(s2)
+        assert executor.protocols == [s1]
+
+    @pytest.mark.asyncio
+    async def test_process_task_finds_node_attached_after_add(self, executor: Executor):
+        s = Start()
+        p1 = Protocol(name="P1", duration=timedelta(seconds=1))
+        s > p1
+        await executor.add_protocol(s)
+
+        # attached directly to the tree after the index was built, so the
+        # lookup misses and process_task has to rebuild it
+        index = executor._get_node_index()
+        p2 = Protocol(name="P2", duration=timedelta(seconds=1))
+        s > p2
+        assert p2.id not in index
+        await executor.process_task(_task(p2.id))
+        assert p2.state == ProtocolState.COMPLETED
+        assert p2.finished_time is not None
+
+    @pytest.mark.asyncio
+    async def test_process_task_rejects_non_protocol_node(self, executor: Executor):
+        s = Start()
+        d = Delay(duration=timedelta(seconds=1))
+        s > Protocol(name="P1", duration=timedelta(seconds=1)) > d
+        await executor.add_protocol(s)
+
+        with pytest.raises(ValueError, match="No protocol found"):
+            await executor.process_task(_task(d.id))
+
+    def test_resume_rejects_duplicate_ids(self, tmp_path: Path):
+        storage = LocalJSONStorage(filepath=tmp_path / ".state.json")
+        s1 = Start()
+        p1 = Protocol(name="P1", duration=timedelta(seconds=1))
+        s1 > p1
+        s2 = Start()
+        s2 > Protocol(name="P1 again", id=p1.id)
+        storage.save(
+            {
+                "metadata": {},
+                "protocols": [s.model_dump(mode="json") for s in (s1, s2)],
+            }
+        )
+        with pytest.raises(ValueError, match="duplicate node IDs"):
+            Executor(
+                optimizer=Optimizer(max_solve_time=1),
+                driver=DummyDriver(),
+                json_storage=storage,
+                resume=True,
+            )
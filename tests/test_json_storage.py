@@ -28,6 +28,11 @@ class TestLocalJSONStorage:
         loaded = storage.load()
         assert loaded["version"] == 2
 
+    def test_save_leaves_no_temp_file(self, storage: LocalJSONStorage):
+        storage.save({"version": 1})
+        storage.save({"version": 2})
+        assert [p.name for p in storage.filepath.parent.iterdir()] == [".state.json"]
+
     def test_load_no_file_raises(self, storage: LocalJSONStorage):
         with pytest.raises(FileNotFoundError):
             storage.load()
@@ -38,6 +43,15 @@ class TestLocalJSONStorage:
         s.save({"ok": True})
         assert nested.exists()
 
+    def test_save_recreates_removed_directory(self, tmp_path: Path):
+        nested = tmp_path / "sub" / ".state.json"
+        s = LocalJSONStorage(filepath=nested)
+        s.save({"version": 1})
+        nested.unlink()
+        nested.parent.rmdir()
+        s.save({"version": 2})
+        assert s.load() == {"version": 2}
+
     def test_roundtrip_nested_data(self, storage: LocalJSONStorage):
         data = {
             "protocols": [
@@ -55,3 +69,11 @@ class TestLocalJSONStorage:
         storage.save(data)
         loaded = storage.load()
         assert loaded == data
+
+    def test_stdlib_fallback_roundtrip(
+        self, storage: LocalJSONStorage, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr("src.json_storage.orjson", None)
+        data = {"name": "テスト", "values": [1, 2.5, None, True]}
+        storage.save(data)
+        assert storage.load() == data
@@ -0,0 +1,63 @@
+"""Tests for src.logging_config — JSON log record formatting."""
+
+import json
+import logging
+from datetime import datetime
+
+import pytest
+
+from src.logging_config import JsonFormatter
+
+
+def _record(msg, *args, **extra) -> logging.LogRecord:
+    record = logging.LogRecord("executor", logging.INFO, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+class TestJsonFormatter:
+    def test_dict_message_merged(self):
+        line = JsonFormatter().format(
+            _record({"function": "optimize", "type": "end", "name_jp": "テスト"})
+        )
+        entry = json.loads(line)
+        assert entry["name"] == "executor"
+        assert entry["levelname"] == "INFO"
+        assert entry["message"] == ""
+        assert entry["function"] == "optimize"
+        assert entry["type"] == "end"
+        assert entry["name_jp"] == "テスト"
+        assert "asctime" in entry
+
+    def test_str_message_formatted(self):
+        entry = json.loads(JsonFormatter().format(_record("Loaded %s", "p.py")))
+        assert entry["message"] == "Loaded p.py"
+
+    def test_extra_fields(self):
+        entry = json.loads(JsonFormatter().format(_record("msg", k=1)))
+        assert entry["k"] == 1
+
+    def test_asctime_matches_stdlib(self):
+        formatter = JsonFormatter()
+        for created in (1700000000.5, 1700000000.999, 1700000001.0):
+            record = _record("msg")
+            record.created = created
+            record.msecs = int((created - int(created)) * 1000)
+            assert formatter.formatTime(record) == logging.Formatter().formatTime(
+                record
+            )
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_datetime_isoformat(self, use_orjson, monkeypatch: pytest.MonkeyPatch):
+        if not use_orjson:
+            monkeypatch.setattr("src.logging_config.orjson", None)
+        t = datetime(2025, 1, 1, 12, 0, 0, 123456)
+        entry = json.loads(JsonFormatter().format(_record({"t": t})))
+        assert datetime.fromisoformat(entry["t"]) == t
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_non_str_keys(self, use_orjson, monkeypatch: pytest.MonkeyPatch):
+        if not use_orjson:
+            monkeypatch.setattr("src.logging_config.orjson", None)
+        entry = json.loads(JsonFormatter().format(_record({"result": {1: "x"}})))
+        assert entry["result"] == {"1": "x"}
@@ -28,6 +28,13 @@ class TestTimeSecondsConverter:
         assert tsc.time_to_seconds(base + timedelta(seconds=60)) == 60.0
         assert tsc.seconds_to_time(120) == base + timedelta(seconds=120)
 
+    def test_int_seconds_truncates(self):
+        base = datetime(2025, 1, 1, 12, 0, 0)
+        tsc = TimeSecondsConverter(base)
+        later = base + timedelta(seconds=90, microseconds=999_999)
+        assert tsc.time_to_int_seconds(later) == 90
+        assert isinstance(tsc.time_to_int_seconds(later), int)
+
 
 class TestGetOldestTime:
     def test_with_started_times(self):
@@ -44,6 +51,16 @@ class TestGetOldestTime:
         result = get_oldest_time([p1])
         assert (datetime.now() - result).total_seconds() < 2
 
+    def test_without_started_times_uses_default(self):
+        p1 = Protocol(name="P1")
+        t = datetime(2025, 1, 1, 12, 0, 0)
+        assert get_oldest_time([p1], default=t) == t
+
+    def test_keeps_microseconds(self):
+        t1 = datetime(2025, 1, 1, 12, 0, 0, 123456)
+        p1 = Protocol(name="P1", started_time=t1)
+        assert get_oldest_time([Start(), p1]) == t1
+
 
 class TestSumDurations:
     def test_sum(self):
@@ -155,6 +172,18 @@ class TestOptimizer:
         assert p1.scheduled_time == now
         assert p2.scheduled_time >= now + timedelta(seconds=10)
 
+    def test_with_running_protocol(self):
+        """A started but unfinished protocol keeps its start time."""
+        s = Start()
+        now = datetime.now().replace(microsecond=0)
+        p1 = Protocol(name="P1", duration=timedelta(seconds=10), started_time=now)
+        p2 = Protocol(name="P2", duration=timedelta(seconds=5))
+        s > p1 > p2
+
+        Optimizer(buffer_seconds=0).optimize_schedule(s)
+        assert p1.scheduled_time == now
+        assert p2.scheduled_time >= now + timedelta(seconds=10)
+
     def test_makespan_minimized(self):
         """Optimizer should produce a compact schedule."""
         s = Start()
@@ -182,3 +211,16 @@ class TestOptimizer:
         # All protocols should have scheduled times
         for p in [p1, p2, p3]:
             assert p.scheduled_time is not None
+
+    def test_named_vars(self):
+        """Naming CP-SAT variables for debugging does not change the result."""
+        s = Start()
+        p1 = Protocol(name="P1", duration=timedelta(seconds=10))
+        d = Delay(duration=timedelta(seconds=20), from_type=FromType.FINISH)
+        p2 = Protocol(name="P2", duration=timedelta(seconds=5))
+        s > p1 > d > p2
+
+        status = Optimizer(buffer_seconds=0, name_vars=True).optimize_schedule(s)
+        assert status in ("OPTIMAL", "FEASIBLE")
+        gap = (p2.scheduled_time - (p1.scheduled_time + p1.duration)).total_seconds()
+        assert abs(gap - 20) <= 1
@@ -4,6 +4,7 @@ import json
 from datetime import datetime, timedelta
 
 import pytest
+from pydantic import ValidationError
 
 from src.protocol import (
     Delay,
@@ -11,6 +12,7 @@ from src.protocol import (
     NodeType,
     Protocol,
     Start,
+    format_protocol,
     protocol_from_dict,
 )
 
@@ -105,6 +107,27 @@ class TestDAGConstruction:
         with pytest.raises(ValueError, match="recursive"):
             p1.add(s)
 
+    def test_recursive_list_add_raises(self):
+        s = Start()
+        p1 = Protocol(name="P1")
+        p2 = Protocol(name="P2")
+        s > p1
+        with pytest.raises(ValueError, match="recursive"):
+            p1 > [p2, s]
+
+    def test_duplicate_in_list_raises(self):
+        s = Start()
+        p1 = Protocol(name="P1")
+        with pytest.raises(ValueError, match="recursive"):
+            s > [p1, p1]
+
+    def test_add_unchecked(self):
+        s = Start()
+        p1 = Protocol(name="P1")
+        s.add(p1, check_recursive=False)
+        assert s.post_node[0] is p1
+        assert p1.pre_node is s
+
     def test_delay_in_chain(self):
         s = Start()
         p1 = Protocol(name="P1")
@@ -137,6 +160,16 @@ class TestTreeTraversal:
         flat = s.flatten()
         assert len(flat) == 4
 
+    def test_flatten_depth_first_order(self):
+        s = Start()
+        p1 = Protocol(name="P1")
+        p2 = Protocol(name="P2")
+        p3 = Protocol(name="P3")
+        p4 = Protocol(name="P4")
+        s > p1 > [p2 > p3, p4]
+        flat = s.flatten()
+        assert [n.id for n in flat] == [s.id, p1.id, p2.id, p3.id, p4.id]
+
     def test_get_node_found(self):
         s = Start()
         p1 = Protocol(name="P1")
@@ -144,6 +177,26 @@ class TestTreeTraversal:
         assert s.get_node(p1.id) is not None
         assert s.get_node(p1.id).name == "P1"
 
+    def test_iter_flatten_is_lazy(self):
+        s = Start()
+        p1 = Protocol(name="P1")
+        p2 = Protocol(name="P2")
+        s > p1 > p2
+        it = s.iter_flatten()
+        assert next(it) is s
+        assert next(it) is p1
+        assert [n.id for n in s.iter_flatten()] == [n.id for n in s.flatten()]
+
+    def test_index(self):
+        s = Start()
+        p1 = Protocol(name="P1")
+        d = Delay()
+        p2 = Protocol(name="P2")
+        s > p1 > d > p2
+        index = s.index()
+        assert set(index) == {s.id, p1.id, d.id, p2.id}
+        assert index[p2.id] is p2
+
     def test_get_node_not_found(self):
         s = Start()
         import uuid
@@ -166,6 +219,18 @@ class TestTopProperty:
         s = Start()
         assert s.top.id == s.id
 
+    def test_top_deep_chain(self):
+        import sys
+
+        s = Start()
+        node = s
+        for i in range(sys.getrecursionlimit() + 10):
+            child = Protocol(name=f"P{i}")
+            node.post_node.append(child)
+            child.pre_node = node
+            node = child
+        assert node.top is s
+
 
 # ── Serialization roundtrip ──────────────────────────────────────────
 
@@ -247,6 +312,15 @@ class TestSerialization:
         names = {n.name for n in flat if isinstance(n, Protocol)}
         assert names == {"P1", "P2", "P3"}
 
+    def test_unknown_node_type_raises(self):
+        with pytest.raises(ValueError, match="node_type"):
+            protocol_from_dict({"node_type": "unknown"})
+
+    @pytest.mark.parametrize("data", [["start"], {"node_type": ["start"]}])
+    def test_malformed_entry_raises_validation_error(self, data):
+        with pytest.raises(ValidationError):
+            protocol_from_dict(data)
+
 
 # ── __str__ ───────────────────────────────────────────────────────────
 
@@ -263,3 +337,44 @@ class TestStr:
     def test_delay_str(self):
         d = Delay(duration=timedelta(seconds=10))
         assert "Delay" in str(d)
+
+    def test_nested_str_indentation(self):
+        s = Start()
+        p1 = Protocol(name="P1")
+        d = Delay(duration=timedelta(seconds=10))
+        p2 = Protocol(name="P2")
+        s > p1 > d > p2
+        lines = str(s).split("\n")
+        assert lines[0] == "Start()"
+        assert lines[1].startswith("  Protocol(name=P1")
+        assert lines[2].startswith("    Delay(")
+        assert lines[3].startswith("      Protocol(name=P2")
+
+
+# ── format_protocol ──────────────────────────────────────────────────
+
+
+class TestFormatProtocol:
+    def test_schedule_and_delay_lines(self):
+        s = Start()
+        t0 = datetime(2025, 1, 1, 12, 0, 0)
+        p1 = Protocol(name="P1", duration=timedelta(seconds=10), scheduled_time=t0)
+        d = Delay(duration=timedelta(seconds=20), from_type=FromType.FINISH)
+        p2 = Protocol(
+            name="P2",
+            duration=timedelta(seconds=5),
+            scheduled_time=t0 + timedelta(seconds=30),
+        )
+        s > p1 > d > p2
+
+        lines = format_protocol(s).splitlines()
+        assert lines == [
+            "Schedule: (total duration: 0:00:35)",
+            " - P1: [0:00:00] 2025-01-01 12:00:00 ~ 2025-01-01 12:00:10"
+            " (Duration: 0:00:10) ",
+            " - P2: [0:00:30] 2025-01-01 12:00:30 ~ 2025-01-01 12:00:35"
+            " (Duration: 0:00:05) ",
+            "Delay:",
+            " - P1 -- 2025-01-01 12:00:10 ~ 2025-01-01 12:00:30"
+            " | 0:00:20(target: 0:00:20) -> P2",
+        ]